@@ -1,11 +1,40 @@
-from flask import Flask, render_template, request, jsonify
-from bs4 import BeautifulSoup
+from flask import Flask, render_template, request
+from flask_compress import Compress
+from waitress import serve
+from lxml import etree
+import orjson
 from collections import defaultdict
-import subprocess
-import tempfile
+from array import array
+from itertools import accumulate
+from functools import lru_cache
+from heapq import nlargest, nsmallest
+from operator import itemgetter
+from cachetools import LRUCache
+import hashlib
 import os
+import pathlib
+import pickle
+import re
+import sys
+import tempfile
+import threading
+
+import extract_dynamic_urls
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    sparse = None
 
 app = Flask(__name__)
+# gzip/brotli responses; the /upload JSON is large and very compressible
+Compress(app)
 
 # Auto-tagging patterns
 AUTO_TAG_PATTERNS = {
@@ -20,129 +49,306 @@ AUTO_TAG_PATTERNS = {
     'Debug': ['debug', 'test', 'dev', 'trace', 'verbose', 'log']
 }
 
+# Parsed uploads are pickled here keyed on a hash of the file. It lives next
+# to the app rather than in a shared /tmp since the pickles get loaded back.
+# Bump CACHE_VERSION whenever the parsed/processed structures change.
+CACHE_DIR = pathlib.Path(__file__).resolve().parent / '.paradowat_cache'
+CACHE_VERSION = 4
+# Only the most recently used uploads are kept on disk
+CACHE_MAX_ENTRIES = 8
+
+def build_tag_matcher():
+    """Compile AUTO_TAG_PATTERNS into a multi-pattern matcher
+    
+    Uses an Aho-Corasick automaton mapping each pattern to all the tags it
+    implies ('id' is both IDOR and SQLi). Without pyahocorasick, falls back
+    to one regex with an optional lookahead group per tag, so a single
+    match call reports every tag even when patterns overlap ('keyword'
+    also contains 'key').
+    """
+    if ahocorasick is None:
+        lookaheads = []
+        for i, patterns in enumerate(AUTO_TAG_PATTERNS.values()):
+            alternation = '|'.join(map(re.escape, patterns))
+            lookaheads.append(f'(?:(?=.*?(?P<tag{i}>{alternation})))?')
+        return None, re.compile(''.join(lookaheads), re.DOTALL)
+    
+    pattern_tags = defaultdict(tuple)
+    for tag, patterns in AUTO_TAG_PATTERNS.items():
+        for pattern in patterns:
+            pattern_tags[pattern] += (tag,)
+    
+    automaton = ahocorasick.Automaton()
+    for pattern, tags in pattern_tags.items():
+        automaton.add_word(pattern, tags)
+    automaton.make_automaton()
+    return automaton, None
+
+TAG_AUTOMATON, TAG_REGEX = build_tag_matcher()
+
+# Names repeat across URLs and relationship lookups; the result is a tuple
+# so cached entries can be shared safely
+@lru_cache(maxsize=4096)
 def get_auto_tags(param_name):
     """Get auto tags for a parameter"""
-    tags = []
     lower_name = param_name.lower()
-    for tag, patterns in AUTO_TAG_PATTERNS.items():
-        if any(pattern in lower_name for pattern in patterns):
-            tags.append(tag)
-    return tags
+    
+    if TAG_AUTOMATON is None:
+        hits = TAG_REGEX.match(lower_name).groups()
+        return tuple(tag for tag, hit in zip(AUTO_TAG_PATTERNS, hits) if hit is not None)
+    
+    found = set()
+    for _, tags in TAG_AUTOMATON.iter(lower_name):
+        found.update(tags)
+    return tuple(tag for tag in AUTO_TAG_PATTERNS if tag in found)
 
-def parse_burp_html(html_content):
-    """Parse cleaned Burp Suite HTML"""
-    soup = BeautifulSoup(html_content, 'html.parser')
+def url_from_item(item, nested=None):
+    """The URL text of a top level <li>, or None if it isn't one
     
-    main_ul = soup.find('ul')
-    if not main_ul:
-        return []
+    With nested, only the text in front of that nested list is read.
+    """
+    if nested is None:
+        parts = item.itertext()
+    else:
+        # The parser runs ahead of the events it reports, so the item may
+        # already hold the nested list and everything after it
+        parts = []
+        for event, element in etree.iterwalk(item, events=('start', 'end', 'comment')):
+            if element is nested:
+                break
+            if event == 'start':
+                parts.append(element.text)
+            elif element is not item:
+                parts.append(element.tail)
     
-    urls = []
+    text = ''.join(t.strip() for t in parts if t)
+    return text if text.startswith('http') else None
+
+def parse_burp_html(html_content):
+    """Parse cleaned Burp Suite HTML"""
+    # URLs are stored column-wise: parameter row i belongs to
+    # url_strs[param_url_idx[i]]
+    url_strs = []
+    param_keys = []
+    param_vals = []
+    param_url_idx = array('i')
     current_url = None
+    current_idx = None
+    # Top level item whose URL text hasn't been read yet; it is read when
+    # the item opens a nested list or closes, whichever comes first
+    open_item = None
+    ul_depth = 0
     
-    for child in main_ul.children:
-        if not hasattr(child, 'name'):
-            continue
-            
-        if child.name == 'li':
-            url_text = child.get_text(strip=True)
-            if url_text.startswith('http'):
-                current_url = {
-                    'url': url_text,
-                    'parameters': []
-                }
-                urls.append(current_url)
-        elif child.name == 'ul' and current_url:
-            for param_li in child.find_all('li'):
-                param_text = param_li.get_text(strip=True)
-                if param_text and '=' in param_text:
-                    key, value = param_text.split('=', 1)
-                    current_url['parameters'].append({
-                        'key': key.strip(),
-                        'value': value.strip()
-                    })
-                elif param_text:
-                    current_url['parameters'].append({
-                        'key': param_text.strip(),
-                        'value': ''
-                    })
-    
-    return [u for u in urls if u['parameters']]
+    # Same pull-parser helper the extraction step uses; its output is UTF-8
+    for event, element in extract_dynamic_urls.iter_html_events(html_content):
+        tag = element.tag
+        
+        if tag == 'ul':
+            if event == 'start':
+                ul_depth += 1
+                if ul_depth == 2 and open_item is not None:
+                    # Parameters nested inside their URL's item
+                    # (<li>url<ul>...</ul></li>) belong to that URL
+                    current_url = url_from_item(open_item, element)
+                    current_idx = None
+                    open_item = None
+            else:
+                ul_depth -= 1
+                if ul_depth == 0:
+                    # Only the first list holds URLs
+                    break
+        elif tag == 'li' and event == 'start':
+            if ul_depth == 1:
+                open_item = element
+        elif tag == 'li' and event == 'end':
+            if ul_depth == 1:
+                # Items that held a nested list already had their URL
+                # taken when it opened
+                if element is open_item:
+                    open_item = None
+                    text = url_from_item(element)
+                    if text is not None:
+                        # Only stored once it turns out to have parameters
+                        current_url = text
+                        current_idx = None
+            elif ul_depth > 1 and current_url is not None:
+                text = ''.join(t.strip() for t in element.itertext())
+                if text:
+                    if current_idx is None:
+                        current_idx = len(url_strs)
+                        url_strs.append(current_url)
+                    # text is already stripped at both ends, so only the
+                    # padding around '=' needs trimming (a no-op when absent).
+                    # Keys repeat across thousands of URLs, so share one
+                    # string object per name; values are too varied to bother
+                    key, _, value = text.partition('=')
+                    param_keys.append(sys.intern(key.rstrip()))
+                    param_vals.append(value.lstrip())
+                    param_url_idx.append(current_idx)
+        
+        if event == 'end' and tag in ('li', 'ul'):
+            # Drop everything already handled to keep memory flat. Only
+            # items, lists and headers: clear() also drops an element's
+            # tail, so inline markup (<b>id</b>=1) has to survive until its
+            # enclosing item's text has been read
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+    
+    return {
+        'url_strs': url_strs,
+        'param_keys': param_keys,
+        'param_vals': param_vals,
+        'param_url_idx': param_url_idx
+    }
 
-def process_urls(urls):
-    """Process URLs into parameter data structure"""
+def process_urls(urls, limit=None):
+    """Process URLs into parameter data structure
+    
+    With a limit, all_param_names only lists the top `limit` parameters.
+    """
     param_data = {}
-    all_params = set()
     
-    for url_obj in urls:
-        for param in url_obj['parameters']:
-            key = param['key']
-            all_params.add(key)
-            
-            if key not in param_data:
-                param_data[key] = {
-                    'values': {},
-                    'total_occurrences': 0,
-                    'auto_tags': get_auto_tags(key),
-                    'has_empty_values': False
-                }
-            
-            value = param['value'] if param['value'] else '(empty)'
-            if value not in param_data[key]['values']:
-                param_data[key]['values'][value] = []
-            
-            # Track if parameter has empty values
-            if not param['value']:
-                param_data[key]['has_empty_values'] = True
-            
-            param_data[key]['values'][value].append(url_obj['url'])
-            param_data[key]['total_occurrences'] += 1
+    url_strs = urls['url_strs']
+    
+    for key, raw_value, url_idx in zip(urls['param_keys'], urls['param_vals'], urls['param_url_idx']):
+        # One lookup per row into param_data and one into its values
+        data = param_data.get(key)
+        if data is None:
+            data = param_data[key] = {
+                'values': {},
+                'total_occurrences': 0,
+                'auto_tags': get_auto_tags(key),
+                'has_empty_values': False
+            }
+        
+        value = raw_value if raw_value else '(empty)'
+        url_list = data['values'].get(value)
+        if url_list is None:
+            url_list = data['values'][value] = []
+        
+        # Track if parameter has empty values
+        if not raw_value:
+            data['has_empty_values'] = True
+        
+        url_list.append(url_strs[url_idx])
+        data['total_occurrences'] += 1
     
     # Sort parameters with priority:
     # 1. Most appeared parameters with most attack tags first
     # 2. Other most appeared parameters
     # 3. Parameters with values
     # 4. Parameters with empty values last
-    def sort_key(param_name):
-        data = param_data[param_name]
-        num_tags = len(data['auto_tags'])
-        occurrences = data['total_occurrences']
+    # Keys are built once per parameter and end with the (unique) name,
+    # so the tuples sort directly and the name is read back off the end
+    ranked = []
+    for param_name, data in param_data.items():
         has_values = not data['has_empty_values'] or len(data['values']) > 1
-        
-        # Return tuple for sorting (higher priority = lower numbers)
-        # Priority 1: Parameters with tags and high occurrences (negative for descending)
-        # Priority 2: High occurrences (negative for descending)
-        # Priority 3: Has non-empty values (0 = has values, 1 = only empty)
-        # Priority 4: Alphabetical
-        return (
-            -occurrences,       # More occurrences = higher priority
-            -num_tags,  # Attack tags first (more tags = higher priority)                
-            0 if has_values else 1,             # Has values before empty-only
-            param_name                          # Alphabetical as tiebreaker
-        )
-    
-    sorted_params = sorted(list(all_params), key=sort_key)
+        ranked.append((
+            -data['total_occurrences'],   # More occurrences = higher priority
+            -len(data['auto_tags']),      # Attack tags first (more tags = higher priority)
+            0 if has_values else 1,       # Has values before empty-only
+            param_name                    # Alphabetical as tiebreaker
+        ))
+    if limit is None:
+        ranked.sort()
+    else:
+        # A bounded heap instead of sorting names that get cut anyway
+        ranked = nsmallest(limit, ranked)
+    sorted_params = [item[-1] for item in ranked]
     
     return {
         'params': param_data,
         'all_param_names': sorted_params,
-        'total_urls': len(urls),
-        'total_params': len(all_params)
+        'total_urls': len(url_strs),
+        'total_params': len(param_data)
     }
 
-def get_co_occurrence(urls, target_param):
+def build_param_index(urls):
+    """Index which URLs each parameter appears in
+    
+    With scipy available, also builds a sparse URL x parameter matrix
+    whose row i holds URL i's parameter ids in their original order, and
+    names[id] maps an id back to its parameter name.
+    """
+    param_keys = urls['param_keys']
+    url_indices_by_param = defaultdict(list)
+    url_counts = [0] * len(urls['url_strs'])
+    
+    for key, i in zip(param_keys, urls['param_url_idx']):
+        url_indices = url_indices_by_param[key]
+        # A key repeated within one URL still counts that URL once
+        if not url_indices or url_indices[-1] != i:
+            url_indices.append(i)
+        url_counts[i] += 1
+    
+    # Rows are grouped by URL, so the parameters of URL i are
+    # param_keys[url_offsets[i]:url_offsets[i + 1]]
+    url_offsets = list(accumulate(url_counts, initial=0))
+    
+    param_index = {
+        'url_indices_by_param': url_indices_by_param,
+        'url_offsets': url_offsets
+    }
+    if sparse is None:
+        return param_index
+    
+    name_to_id = {}
+    param_ids = [name_to_id.setdefault(key, len(name_to_id)) for key in param_keys]
+    
+    # Built straight from the CSR arrays, so rows keep their order and a key
+    # repeated within a URL shows up as a duplicate entry that sums as before
+    matrix = sparse.csr_matrix(
+        (
+            np.ones(len(param_ids), dtype=np.int32),
+            np.array(param_ids, dtype=np.int32),
+            np.array(url_offsets, dtype=np.int32)
+        ),
+        shape=(len(url_counts), len(name_to_id))
+    )
+    
+    param_index.update({
+        'name_to_id': name_to_id,
+        'names': list(name_to_id),
+        'matrix': matrix
+    })
+    return param_index
+
+def get_co_occurrence(urls, target_param, param_index):
     """Calculate parameter co-occurrence"""
-    co_occurrence = defaultdict(int)
+    # Only the URLs that contain the target can contribute
+    url_indices = param_index['url_indices_by_param'].get(target_param)
+    if not url_indices:
+        return []
     
-    for url_obj in urls:
-        param_keys = [p['key'] for p in url_obj['parameters']]
-        if target_param in param_keys:
-            for key in param_keys:
+    # Indexes loaded from the disk cache may predate a scipy install
+    if 'matrix' in param_index:
+        rows = param_index['matrix'][url_indices]
+        counts = np.asarray(rows.sum(axis=0)).ravel()
+        counts[param_index['name_to_id'][target_param]] = 0
+        
+        # Highest counts first, ties in the order the rows first mention them
+        ids, first_seen = np.unique(rows.indices, return_index=True)
+        hit = counts[ids] > 0
+        ids, first_seen = ids[hit], first_seen[hit]
+        top = ids[np.lexsort((first_seen, -counts[ids]))][:10]
+        top_items = [(param_index['names'][i], int(counts[i])) for i in top]
+    else:
+        co_occurrence = defaultdict(int)
+        
+        param_keys = urls['param_keys']
+        url_offsets = param_index['url_offsets']
+        
+        for i in url_indices:
+            for key in param_keys[url_offsets[i]:url_offsets[i + 1]]:
                 if key != target_param:
                     co_occurrence[key] += 1
+        
+        # Same order as a stable sort by count, without sorting everything
+        top_items = nlargest(10, co_occurrence.items(), key=itemgetter(1))
     
     result = []
-    for param, count in sorted(co_occurrence.items(), key=lambda x: x[1], reverse=True)[:10]:
+    for param, count in top_items:
         result.append({
             'param': param,
             'count': count,
@@ -151,11 +357,79 @@ def get_co_occurrence(urls, target_param):
     
     return result
 
+def get_cache_path(file_bytes, limit):
+    """Cache file for an upload, keyed on its content hash and limit"""
+    digest = hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+    suffix = '' if limit is None else f'-top{limit}'
+    return CACHE_DIR / f'v{CACHE_VERSION}-{digest}{suffix}.pkl'
+
+def load_cached(cache_path):
+    """Load a cached (file_size, urls, processed, param_index) tuple, or None on a miss"""
+    try:
+        data = pickle.loads(cache_path.read_bytes())
+    except Exception:
+        # Missing, truncated or unreadable - parse the upload again
+        return None
+    
+    # Mark as recently used so pruning keeps it
+    try:
+        os.utime(cache_path)
+    except OSError:
+        pass
+    return data
+
+def store_cached(cache_path, data):
+    """Pickle parse results for reuse; caching is best effort"""
+    try:
+        CACHE_DIR.mkdir(mode=0o700, exist_ok=True)
+        payload = pickle.dumps(data, protocol=5)
+        # Write then rename so concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            # prune_cache only sees *.pkl, so don't leave the temp file behind
+            os.unlink(tmp_path)
+            raise
+        prune_cache()
+    except OSError:
+        pass
+
+def prune_cache():
+    """Delete cache files beyond the CACHE_MAX_ENTRIES most recently used"""
+    entries = sorted(
+        CACHE_DIR.glob('*.pkl'),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True
+    )
+    for path in entries[CACHE_MAX_ENTRIES:]:
+        path.unlink(missing_ok=True)
+
 # Store data in memory
 app_data = {
-    'urls': [],
-    'processed': None
+    'urls': None,
+    'processed': None,
+    'param_index': None,
+    # Relationship results per parameter; only valid for the current upload
+    'cooc_cache': LRUCache(maxsize=512)
 }
+# Requests are served from several threads; guards swapping in a new
+# upload and the (not thread-safe) relationship cache
+data_lock = threading.Lock()
+
+def ojson(obj, status=200):
+    """JSON response serialized with orjson
+    
+    Keys are sorted like jsonify does, since the frontend lists parameter
+    values in the order they arrive.
+    """
+    return app.response_class(
+        orjson.dumps(obj, option=orjson.OPT_SORT_KEYS),
+        status=status,
+        mimetype='application/json'
+    )
 
 @app.route('/')
 def index():
@@ -166,105 +440,108 @@ def index():
 def upload():
     """Handle file upload and parsing"""
     if 'file' not in request.files:
-        return jsonify({'error': 'No file uploaded'}), 400
+        return ojson({'error': 'No file uploaded'}, 400)
     
     file = request.files['file']
     if file.filename == '':
-        return jsonify({'error': 'No file selected'}), 400
+        return ojson({'error': 'No file selected'}, 400)
     
     # Read file as bytes
     file_bytes = file.read()
     
-    # Save to temporary file
-    with tempfile.NamedTemporaryFile(mode='wb', suffix='.html', delete=False) as temp_input:
-        temp_input.write(file_bytes)
-        temp_input_path = temp_input.name
-    
-    # Create temp output file
-    temp_output = tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False)
-    temp_output_path = temp_output.name
-    temp_output.close()
-    
     try:
-        # Call standalone extraction script
-        print(f"Calling extraction script: {temp_input_path} -> {temp_output_path}")
-        result = subprocess.run(
-            ['python', 'extract_dynamic_urls.py', temp_input_path, temp_output_path],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        print(f"Return code: {result.returncode}")
-        print(f"STDOUT: {result.stdout}")
-        print(f"STDERR: {result.stderr}")
-        
-        if result.returncode != 0:
-            return jsonify({'error': f'Extraction failed: {result.stderr}'}), 400
-        
-        # Read cleaned HTML
-        with open(temp_output_path, 'r', encoding='utf-8') as f:
-            cleaned_html = f.read()
-        
-        print(f"Cleaned HTML length: {len(cleaned_html)}")
-        
-        file_size = len(cleaned_html) / (1024 * 1024)
+        limit = request.form.get('limit', type=int)
+        if limit is not None and limit <= 0:
+            return ojson({'error': 'limit must be a positive integer'}, 400)
         
-        # Parse
-        urls = parse_burp_html(cleaned_html)
-        print(f"Parsed {len(urls)} URLs")
+        # Re-uploads of the same export skip extraction, parsing and indexing
+        cache_path = get_cache_path(file_bytes, limit)
+        cached = load_cached(cache_path)
         
-        processed = process_urls(urls)
-        print(f"Processed {processed['total_params']} parameters")
+        if cached is not None:
+            file_size, urls, processed, param_index = cached
+            print(f"Loaded parse results from cache: {cache_path.name}")
+        else:
+            # Cut the export down to the Dynamic URLs section in-process
+            try:
+                cleaned_html = extract_dynamic_urls.extract(file_bytes)
+            except ValueError as e:
+                return ojson({'error': f'Extraction failed: {e}'}, 400)
+            
+            print(f"Cleaned HTML length: {len(cleaned_html)}")
+            
+            file_size = len(cleaned_html) / (1024 * 1024)
+            
+            # Parse
+            urls = parse_burp_html(cleaned_html)
+            print(f"Parsed {len(urls['url_strs'])} URLs")
+            
+            processed = process_urls(urls, limit)
+            print(f"Processed {processed['total_params']} parameters")
+            
+            param_index = build_param_index(urls)
+            
+            store_cached(cache_path, (file_size, urls, processed, param_index))
         
         # Store
-        app_data['urls'] = urls
-        app_data['processed'] = processed
+        with data_lock:
+            app_data['urls'] = urls
+            app_data['processed'] = processed
+            app_data['param_index'] = param_index
+            app_data['cooc_cache'].clear()
         
-        return jsonify({
+        return ojson({
             'success': True,
             'file_size': round(file_size, 2),
             'data': processed
         })
         
-    except subprocess.TimeoutExpired:
-        return jsonify({'error': 'Extraction timed out'}), 500
     except Exception as e:
-        return jsonify({'error': f'Error: {str(e)}'}), 500
-    finally:
-        # Cleanup
-        try:
-            os.unlink(temp_input_path)
-            os.unlink(temp_output_path)
-        except:
-            pass
+        return ojson({'error': f'Error: {str(e)}'}, 500)
 
 @app.route('/api/parameter/<param_name>')
 def get_parameter_details(param_name):
     """Get details for a specific parameter"""
-    if not app_data['processed']:
-        return jsonify({'error': 'No data loaded'}), 400
+    # Read once so an upload landing mid-request can't swap it underneath
+    with data_lock:
+        processed = app_data['processed']
     
-    if param_name not in app_data['processed']['params']:
-        return jsonify({'error': 'Parameter not found'}), 404
+    if not processed:
+        return ojson({'error': 'No data loaded'}, 400)
     
-    return jsonify({
+    param_data = processed['params'].get(param_name)
+    if param_data is None:
+        return ojson({'error': 'Parameter not found'}, 404)
+    
+    return ojson({
         'param': param_name,
-        'data': app_data['processed']['params'][param_name]
+        'data': param_data
     })
 
 @app.route('/api/relationships/<param_name>')
 def get_relationships(param_name):
     """Get parameter relationships"""
-    if not app_data['urls']:
-        return jsonify({'error': 'No data loaded'}), 400
+    with data_lock:
+        urls = app_data['urls']
+        param_index = app_data['param_index']
+        relationships = app_data['cooc_cache'].get(param_name)
+    
+    if not urls or not urls['url_strs']:
+        return ojson({'error': 'No data loaded'}, 400)
     
-    relationships = get_co_occurrence(app_data['urls'], param_name)
+    if relationships is None:
+        relationships = get_co_occurrence(urls, param_name, param_index)
+        with data_lock:
+            # Don't cache a result for data replaced by a newer upload
+            if app_data['urls'] is urls:
+                app_data['cooc_cache'][param_name] = relationships
     
-    return jsonify({
+    return ojson({
         'param': param_name,
         'relationships': relationships
     })
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
+    # Multi-threaded production server; for auto-reload while developing
+    # use `flask --app ParaDoWat run --debug`
+    serve(app, host='127.0.0.1', port=5000, threads=8)
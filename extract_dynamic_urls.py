@@ -0,0 +1,146 @@
+from lxml import etree
+import sys
+
+# Bytes fed to the HTML pull parser at a time
+PARSE_CHUNK_SIZE = 64 * 1024
+
+# Minimal document wrapped around the extracted list
+OUTPUT_HEAD = b"""<!DOCTYPE html>
+<html>
+<head>
+    <title>Dynamic URLs - Extracted</title>
+    <meta charset="UTF-8">
+</head>
+<body>
+<h2>Dynamic URLs</h2>
+"""
+OUTPUT_TAIL = b"""
+</body>
+</html>"""
+
+def iter_html_events(html_bytes):
+    """Stream (event, element) pairs for raw HTML bytes with lxml"""
+    if not html_bytes:
+        return
+    
+    parser = etree.HTMLPullParser(events=('start', 'end'), encoding='utf-8')
+    for offset in range(0, len(html_bytes), PARSE_CHUNK_SIZE):
+        parser.feed(html_bytes[offset:offset + PARSE_CHUNK_SIZE])
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+def extract(html_bytes):
+    """
+    Extract only the Dynamic URLs section from Burp Suite HTML export
+    bytes and return it as a minimal UTF-8 HTML document
+    """
+    print(f"File size: {len(html_bytes)} bytes")
+    
+    # Stream the document, stopping as soon as the section's list closes
+    print("\nFound H2 tags:")
+    section_parent = None
+    ul = None
+    # Open <h2> elements; their contents are kept until the header's text
+    # has been read
+    h2_depth = 0
+    
+    for event, element in iter_html_events(html_bytes):
+        if ul is not None:
+            # Keep the list intact until it is complete
+            if event == 'end' and element is ul:
+                break
+            continue
+        
+        if event == 'start':
+            if element.tag == 'h2':
+                h2_depth += 1
+            # The first <ul> sibling of the Dynamic URLs header
+            elif element.tag == 'ul' and section_parent is not None \
+                    and element.getparent() is section_parent:
+                ul = element
+            continue
+        
+        if element.tag == 'h2':
+            h2_depth -= 1
+            if section_parent is None:
+                h2_text = ''.join(t.strip() for t in element.itertext())
+                print(f"  - {h2_text}")
+                if 'Dynamic' in h2_text and 'URL' in h2_text:
+                    section_parent = element.getparent()
+                    print(f"\nFound target H2: {h2_text}")
+        elif h2_depth:
+            # clear() would take this element's text and tail out of the
+            # enclosing header before it is read (<h2><span>Dynamic</span>
+            # URLs</h2>)
+            continue
+        
+        # Drop everything already passed to keep memory flat
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+    
+    if section_parent is None:
+        raise ValueError("Could not find 'Dynamic URLs' header")
+    
+    if ul is None:
+        raise ValueError("No UL found after Dynamic URLs header")
+    
+    # Direct <li> children only
+    items = ul.findall('li')
+    print(f"Found UL with {len(items)} items")
+    
+    # Count URLs; only the first text of each item matters, so don't
+    # join up all of its parameters
+    url_count = 0
+    for li in items:
+        text = next(filter(None, map(str.strip, li.itertext())), '')
+        if text.startswith('http'):
+            url_count += 1
+    
+    print(f"Found {url_count} URLs")
+    
+    # Serialise straight to UTF-8 rather than building and re-encoding a str
+    ul_html = etree.tostring(ul, method='html', encoding='utf-8', with_tail=False)
+    
+    # Create new HTML with just the Dynamic URLs section
+    new_html = OUTPUT_HEAD + ul_html + OUTPUT_TAIL
+    
+    print(f"Output size: {len(new_html)} bytes")
+    
+    return new_html
+
+def extract_dynamic_urls(input_file, output_file):
+    """
+    Extract only the Dynamic URLs section from Burp Suite HTML export
+    and save it to a new file
+    """
+    print(f"Reading file: {input_file}")
+    
+    # Read the file
+    with open(input_file, 'rb') as f:
+        html_bytes = f.read()
+    
+    try:
+        new_html = extract(html_bytes)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    
+    # Write to output file
+    with open(output_file, 'wb') as f:
+        f.write(new_html)
+    
+    print(f"\nExtracted section saved to: {output_file}")
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python extract_dynamic_urls.py <input.html> <output.html>")
+        print("\nExample:")
+        print("  python extract_dynamic_urls.py burp_export.html dynamic_only.html")
+        sys.exit(1)
+    
+    input_file = sys.argv[1]
+    output_file = sys.argv[2]
+    
+    extract_dynamic_urls(input_file, output_file)
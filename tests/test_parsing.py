@@ -0,0 +1,124 @@
+import importlib.util
+import io
+import pathlib
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import extract_dynamic_urls  # noqa: E402
+
+
+def load_app(relative_path, name):
+    spec = importlib.util.spec_from_file_location(name, ROOT / relative_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+APPS = {
+    'app': load_app('Full_Files/app.py', 'paradowat_full_app'),
+    'ParaDoWat': load_app('ParaDoWat.py', 'paradowat_root_app'),
+}
+
+
+def export(body):
+    return f'<html><body>{body}</body></html>'.encode('utf-8')
+
+
+def rows(urls):
+    return [
+        (urls['url_strs'][i], key, value)
+        for key, value, i in zip(urls['param_keys'], urls['param_vals'], urls['param_url_idx'])
+    ]
+
+
+@pytest.fixture(params=sorted(APPS))
+def app(request):
+    return APPS[request.param]
+
+
+def test_inline_markup_in_parameters(app):
+    html = export(
+        '<h2>Dynamic URLs</h2><ul>'
+        '<li>http://a/1</li>'
+        '<ul><li><b>id</b>=1</li><li>q=<i>hi</i></li><li>a<br>b=2</li></ul>'
+        '<li><a href="#">http://a/2</a><ul><li><code>x</code>=<b>y</b></li></ul></li>'
+        '</ul>'
+    )
+    assert rows(app.parse_burp_html(html)) == [
+        ('http://a/1', 'id', '1'),
+        ('http://a/1', 'q', 'hi'),
+        ('http://a/1', 'ab', '2'),
+        ('http://a/2', 'x', 'y'),
+    ]
+
+
+def test_parameters_nested_inside_their_url(app):
+    html = export(
+        '<h2>Dynamic URLs</h2><ul>'
+        '<li>http://a/1</li><ul><li>k=1</li></ul>'
+        '<li>http://a/2<ul><li>z=2</li></ul></li>'
+        '<li>notes<ul><li>x=9</li></ul></li>'
+        '</ul>'
+    )
+    assert rows(app.parse_burp_html(html)) == [
+        ('http://a/1', 'k', '1'),
+        ('http://a/2', 'z', '2'),
+    ]
+
+
+@pytest.mark.parametrize('header', [
+    '<h2>Dynamic URLs</h2>',
+    '<H2>Dynamic URLs</H2>',
+    '<h2 class="section"><span>Dynamic URLs</span></h2>',
+    '<h2>\n  Dynamic URLs\n</h2>',
+])
+def test_dynamic_section_after_static_list(header):
+    html = export(
+        '<h2>Static URLs</h2><ul><li>http://s</li><ul><li>s=1</li></ul></ul>'
+        f'{header}<ul><li>http://d</li><ul><li>d=1</li></ul></ul>'
+        '<h2>Other</h2><ul><li>http://o</li><ul><li>o=1</li></ul></ul>'
+    )
+    assert APPS['app'].parse_burp_html(html)['url_strs'] == ['http://d']
+
+
+def test_first_list_without_dynamic_header():
+    html = export('<h2>Static URLs</h2><ul><li>http://s</li><ul><li>s=1</li></ul></ul>')
+    assert APPS['app'].parse_burp_html(html)['url_strs'] == ['http://s']
+
+
+@pytest.mark.parametrize('header', [
+    '<h2>Dynamic URLs</h2>',
+    '<h2><span>Dynamic</span> URLs</h2>',
+    '<h2><b>Dynamic</b> <i>URLs</i> (3)</h2>',
+])
+def test_extract_finds_header_with_inline_markup(header):
+    html = export(
+        '<h2>Static URLs</h2><ul><li>http://s</li></ul>'
+        f'{header}<ul><li>http://d</li><ul><li>d=1</li></ul></ul>'
+    )
+    extracted = extract_dynamic_urls.extract(html)
+    urls = APPS['ParaDoWat'].parse_burp_html(extracted)
+    assert rows(urls) == [('http://d', 'd', '1')]
+
+
+def test_extract_without_header():
+    with pytest.raises(ValueError, match="Could not find 'Dynamic URLs' header"):
+        extract_dynamic_urls.extract(export('<h2>Static URLs</h2><ul><li>http://s</li></ul>'))
+
+
+def test_upload_with_inline_header_markup(monkeypatch, tmp_path):
+    paradowat = APPS['ParaDoWat']
+    monkeypatch.setattr(paradowat, 'CACHE_DIR', tmp_path)
+    html = export('<h2><span>Dynamic</span> URLs</h2><ul><li>http://d</li><ul><li>d=1</li></ul></ul>')
+    
+    response = paradowat.app.test_client().post(
+        '/upload',
+        data={'file': (io.BytesIO(html), 'export.html')}
+    )
+    
+    assert response.status_code == 200
+    assert response.get_json()['data']['all_param_names'] == ['d']